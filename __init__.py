@@ -1,9 +1,12 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+# sustainability first: it imports the profiler, which in turn needs
+# sustainability.calculator to be importable
+from .sustainability import check_prompt_efficiency, check_prompt_efficiency_batch, sustainability_calculator
 from .decorator import guardrail
-from .checks import check_injection, check_pii
-from .sustainability import check_prompt_efficiency, sustainability_calculator
+from .checks import check_injection, check_pii, check_injection_sync, check_pii_sync
+from .checks_hs import check_all
 from .data_models import (
     OnFailAction, 
     GuardrailResult, 
@@ -20,7 +23,11 @@ __all__ = [
     "guardrail",
     "check_injection",
     "check_pii",
+    "check_injection_sync",
+    "check_pii_sync",
+    "check_all",
     "check_prompt_efficiency",
+    "check_prompt_efficiency_batch",
     "sustainability_calculator",
     "OnFailAction",
     "GuardrailResult",
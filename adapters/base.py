@@ -1,8 +1,9 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Awaitable
+from typing import Any, Callable, Awaitable, Optional
 
 class FrameworkAdapter(ABC):
     """Abstract base class for framework adapters."""
@@ -17,7 +18,19 @@ class FrameworkAdapter(ABC):
         """Call the target object with the given arguments."""
         pass
 
+    def bind_call(self, target: Any) -> Callable[..., Awaitable[Any]]:
+        """Return a callable that invokes the target; resolved once at decoration time."""
+        return functools.partial(self.call, target)
+
+    def bind_sync_call(self, target: Any) -> Optional[Callable[..., Any]]:
+        """Return a plain callable for targets that need no awaiting, or None."""
+        return None
+
     @abstractmethod
     def extract_input(self, *args: Any, **kwargs: Any) -> Any:
         """Extract the main input data from the arguments."""
         pass
+
+    def bind_extract(self, target: Any) -> Callable[[tuple, dict], Any]:
+        """Return an `(args, kwargs)` input extractor; resolved once at decoration time."""
+        return lambda args, kwargs: self.extract_input(*args, **kwargs)
@@ -1,10 +1,15 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import inspect
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable, Optional
 from .base import FrameworkAdapter
 
+def is_async_callable(target: Any) -> bool:
+    """True for coroutine functions and objects with an async __call__."""
+    return inspect.iscoroutinefunction(target) or inspect.iscoroutinefunction(getattr(target, "__call__", None))
+
 class PythonFunctionAdapter(FrameworkAdapter):
     """Adapter for standard Python functions (sync and async)."""
     
@@ -16,6 +21,23 @@ class PythonFunctionAdapter(FrameworkAdapter):
             return await target(*args, **kwargs)
         return target(*args, **kwargs)
 
+    def bind_call(self, target: Any) -> Callable[..., Awaitable[Any]]:
+        # Inspect the target once instead of on every call
+        if is_async_callable(target):
+            return functools.partial(self._call_async, target)
+        return functools.partial(self._call_sync, target)
+
+    def bind_sync_call(self, target: Any) -> Optional[Callable[..., Any]]:
+        if is_async_callable(target):
+            return None
+        return target
+
+    async def _call_async(self, target: Any, *args: Any, **kwargs: Any) -> Any:
+        return await target(*args, **kwargs)
+
+    async def _call_sync(self, target: Any, *args: Any, **kwargs: Any) -> Any:
+        return target(*args, **kwargs)
+
     def extract_input(self, *args: Any, **kwargs: Any) -> Any:
         # For simple functions, usually the first arg is the input
         if args:
@@ -25,6 +47,26 @@ class PythonFunctionAdapter(FrameworkAdapter):
             return next(iter(kwargs.values()))
         return None
 
+    def bind_extract(self, target: Any) -> Callable[[tuple, dict], Any]:
+        # Resolve the name of the first parameter once from the signature
+        try:
+            params = list(inspect.signature(target).parameters.values())
+        except (TypeError, ValueError):
+            params = []
+        if not params or params[0].kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            return super().bind_extract(target)
+
+        first_param = params[0].name
+
+        def extract(args: tuple, kwargs: dict) -> Any:
+            if args:
+                return args[0]
+            if first_param in kwargs:
+                return kwargs[first_param]
+            return next(iter(kwargs.values()), None)
+
+        return extract
+
 class AdapterRegistry:
     def __init__(self):
         self._adapters: list[FrameworkAdapter] = [PythonFunctionAdapter()]
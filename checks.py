@@ -1,27 +1,145 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import re
-from typing import Any
+from typing import Any, Optional
 from .data_models import GuardrailResult
 
+# Optional regex engines, in order of preference: google-re2 (linear-time
+# DFA matching), then pcre2 (JIT-compiled by default), then the stdlib.
+# They only ever scan ASCII input, as bytes: there \d, \b and case folding
+# mean the same in every engine. Other input is scanned with the stdlib's
+# Unicode-aware patterns, so verdicts do not depend on what is installed.
+try:
+    import re2 as _regex
+except ImportError:
+    try:
+        import pcre2 as _regex
+    except ImportError:
+        _regex = re
+
+# Opt-in: set to True to answer repeated inputs (golden sets, retries) from an
+# LRU cache. The cache is process-wide and keeps the input text as its key, so
+# leave it off when inputs may hold PII that must not outlive the request.
+CACHE_RESULTS = False
+_RESULT_CACHE_SIZE = 1024
+
+# Injection phrases are plain substrings, so they are folded into one
+# case-insensitive alternation and the input is scanned once. Flags are given
+# inline because re2 does not accept `re` flag arguments.
+_INJECTION_PHRASES = [
+    "ignore previous instructions",
+    "system prompt",
+    "instead of what you were told",
+    "bypass",
+]
+
+_INJECTION_PATTERN = "(?i)" + "|".join(map(re.escape, _INJECTION_PHRASES))
+_INJECTION_RE = re.compile(_INJECTION_PATTERN)
+_INJECTION_RE_BYTES = _regex.compile(_INJECTION_PATTERN.encode())
+
+# Matched text is mapped back to the phrase it matched, so messages name the
+# listed phrase rather than echoing the input's spelling of it.
+_INJECTION_PHRASE_BY_FOLDED = {phrase.casefold(): phrase for phrase in _INJECTION_PHRASES}
+
+# PII categories are fused into a single alternation so the input is scanned
+# once. Alternatives are tried in order at each position, so the longer card
+# number pattern precedes the phone/SSN patterns it shares a prefix with.
+_PII_PATTERNS = [
+    ("email", r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+"),
+    ("ccn", r"\b\d{4}[-.]?\d{4}[-.]?\d{4}[-.]?\d{4}\b"),
+    ("phone", r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b"),
+    ("ssn", r"\b\d{3}[-.]?\d{2}[-.]?\d{4}\b"),
+    ("ip", r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"),
+    ("dl", r"\b[A-Z]{2}\d{2}\d{4}\d{7}\b"), # AA12 YYYYXXXXXXX
+    ("pn", r"\b[A-Z]\d{7}\b"), #AXXXXXXX
+    ("bank", r"\b\d{11}\b"), #01234567891
+]
+
+_PII_MESSAGES = {
+    "email": "Email address detected",
+    "phone": "Phone number detected",
+    "ssn": "Social Security Number detected",
+    "ccn": "Credit Card Number detected",
+    "dl": "Driver's License Number detected",
+    "pn": "Passport Number detected",
+    "bank": "Bank Account Number detected",
+    "ip": "IP Address detected",
+}
+
+_PII_PATTERN = "|".join(f"(?P<{name}>{pattern})" for name, pattern in _PII_PATTERNS)
+_PII_RE = re.compile(_PII_PATTERN)
+_PII_RE_BYTES = _regex.compile(_PII_PATTERN.encode())
+
+# Messages in group order, looked up by `match.lastindex`: re2 reports
+# `lastgroup` as bytes for bytes patterns, and the PII patterns have no
+# other groups.
+_PII_GROUP_MESSAGES = [_PII_MESSAGES[name] for name, _ in _PII_PATTERNS]
+
+# Every PII pattern needs either an "@" (email) or a digit, and nothing
+# shorter than "a@b.c" can match, so most prompts skip the regex entirely.
+_PII_MIN_LEN = 5
+_DIGIT_RE = re.compile(r"\d")
+
+def _search(pattern, pattern_bytes, text: str):
+    # ASCII text is scanned as bytes with the preferred engine, skipping the
+    # Unicode tables; offsets are the same as in the original str.
+    if text.isascii():
+        return pattern_bytes.search(text.encode("ascii"))
+    return pattern.search(text)
+
+# Scans return the failure message, or None when the input passes, so the
+# cache holds immutable strings and every caller gets its own result.
+def _scan_injection(input_data: str) -> Optional[str]:
+    match = _search(_INJECTION_RE, _INJECTION_RE_BYTES, input_data)
+    if match:
+        matched = input_data[match.start():match.end()].casefold()
+        phrase = _INJECTION_PHRASE_BY_FOLDED.get(matched, matched)
+        return f"Potential injection detected: {phrase}"
+    
+    return None
+
+def _scan_pii(input_data: str) -> Optional[str]:
+    if len(input_data) < _PII_MIN_LEN:
+        return None
+
+    if "@" not in input_data and not _DIGIT_RE.search(input_data):
+        return None
+
+    match = _search(_PII_RE, _PII_RE_BYTES, input_data)
+    if match:
+        return _PII_GROUP_MESSAGES[match.lastindex - 1]
+
+    return None
+
+def _to_result(message: Optional[str]) -> GuardrailResult:
+    if message is None:
+        return GuardrailResult(passed=True)
+    return GuardrailResult(passed=False, message=message)
+
+_scan_injection_cached = functools.lru_cache(maxsize=_RESULT_CACHE_SIZE)(_scan_injection)
+_scan_pii_cached = functools.lru_cache(maxsize=_RESULT_CACHE_SIZE)(_scan_pii)
+
+def check_injection_sync(input_data: Any) -> GuardrailResult:
+    """Synchronous variant of `check_injection`."""
+    if type(input_data) is not str:
+        input_data = str(input_data)
+    if CACHE_RESULTS:
+        return _to_result(_scan_injection_cached(input_data))
+    return _to_result(_scan_injection(input_data))
+
+def check_pii_sync(input_data: Any) -> GuardrailResult:
+    """Synchronous variant of `check_pii`."""
+    if type(input_data) is not str:
+        input_data = str(input_data)
+    if CACHE_RESULTS:
+        return _to_result(_scan_pii_cached(input_data))
+    return _to_result(_scan_pii(input_data))
+
 async def check_injection(input_data: Any) -> GuardrailResult:
     """Simple check for prompt injection patterns."""
-    if not isinstance(input_data, str):
-        input_data = str(input_data)
-    
-    patterns = [
-        r"ignore previous instructions",
-        r"system prompt",
-        r"instead of what you were told",
-        r"bypass",
-    ]
-    
-    for pattern in patterns:
-        if re.search(pattern, input_data, re.IGNORECASE):
-            return GuardrailResult(passed=False, message=f"Potential injection detected: {pattern}")
-    
-    return GuardrailResult(passed=True)
+    return check_injection_sync(input_data)
 
 async def check_pii(input_data: Any) -> GuardrailResult:
     """
@@ -36,40 +154,4 @@ async def check_pii(input_data: Any) -> GuardrailResult:
         - IP Addresses
         - URLs
     """
-    if not isinstance(input_data, str):
-        input_data = str(input_data)
-    
-    email_pattern = r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+"
-    phone_pattern = r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b"
-    ssn_pattern = r"\b\d{3}[-.]?\d{2}[-.]?\d{4}\b"
-    ccn_pattern = r"\b\d{4}[-.]?\d{4}[-.]?\d{4}[-.]?\d{4}\b"
-    dl_pattern = r"[A-Z]{2}\d{2}\d{4}\d{7}" # AA12 YYYYXXXXXXX
-    pn_pattern = r"[A-Z]\d{7}" #AXXXXXXX
-    bank_acc_pattern = r"[\d]{11}" #01234567891
-    ip_address_pattern = r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"
-    
-    if re.search(email_pattern, input_data):
-        return GuardrailResult(passed=False, message="Email address detected")
-    
-    if re.search(phone_pattern, input_data):
-        return GuardrailResult(passed=False, message="Phone number detected")
-
-    if re.search(ssn_pattern, input_data):
-        return GuardrailResult(passed=False, message="Social Security Number detected")
-
-    if re.search(ccn_pattern, input_data):
-        return GuardrailResult(passed=False, message="Credit Card Number detected")
-
-    if re.search(dl_pattern, input_data):
-        return GuardrailResult(passed=False, message="Driver's License Number detected")
-
-    if re.search(pn_pattern, input_data):
-        return GuardrailResult(passed=False, message="Passport Number detected")
-
-    if re.search(bank_acc_pattern, input_data):
-        return GuardrailResult(passed=False, message="Bank Account Number detected")
-
-    if re.search(ip_address_pattern, input_data):
-        return GuardrailResult(passed=False, message="IP Address detected")
-
-    return GuardrailResult(passed=True)
+    return check_pii_sync(input_data)
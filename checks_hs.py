@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+from typing import Any, Optional
+from .data_models import GuardrailResult
+from .checks import _INJECTION_PHRASES, _PII_PATTERNS, _PII_MESSAGES, check_injection, check_pii
+
+try:
+    import hyperscan
+except ImportError:  # Optional dependency: python-hyperscan
+    hyperscan = None
+
+def _build_database() -> Optional["hyperscan.Database"]:
+    """Compiles the injection and PII patterns into one Hyperscan database."""
+    if hyperscan is None:
+        return None
+
+    expressions = [re.escape(phrase).encode() for phrase in _INJECTION_PHRASES]
+    expressions += [pattern.encode() for _, pattern in _PII_PATTERNS]
+    # Start-of-match offsets are needed to pick the leftmost match, as `re` does
+    flags = [hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_INJECTION_PHRASES)
+    flags += [hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_PII_PATTERNS)
+
+    db = hyperscan.Database()
+    db.compile(expressions=expressions, ids=list(range(len(expressions))), elements=len(expressions), flags=flags)
+    return db
+
+_HS_DB = _build_database()
+
+# Pattern ids are assigned injection phrases first, then PII categories.
+_HS_PII_FIRST_ID = len(_INJECTION_PHRASES)
+_HS_MESSAGES = [f"Potential injection detected: {phrase}" for phrase in _INJECTION_PHRASES]
+_HS_MESSAGES += [_PII_MESSAGES[name] for name, _ in _PII_PATTERNS]
+
+def _on_match(pattern_id: int, start: int, end: int, flags: int, context: dict) -> None:
+    # Keep the leftmost start seen for each pattern
+    if start < context.get(pattern_id, start + 1):
+        context[pattern_id] = start
+
+def _first_match(starts: dict, ids: range) -> Optional[int]:
+    """
+    The pattern `re` would report for one alternation of `ids`: the leftmost
+    match, with ties going to the pattern listed first.
+    """
+    found = [(starts[i], i) for i in ids if i in starts]
+    return min(found)[1] if found else None
+
+async def check_all(input_data: Any) -> GuardrailResult:
+    """
+    Combined injection and PII check.
+    Scans the input once against every pattern when Hyperscan is available,
+    otherwise runs `check_injection` followed by `check_pii`. Either way,
+    injection is reported before PII, and the reported match is the one those
+    checks would report.
+    """
+    if type(input_data) is not str:
+        input_data = str(input_data)
+
+    # Hyperscan's \d, \b and caseless matching are ASCII-only
+    if _HS_DB is None or not input_data.isascii():
+        result = await check_injection(input_data)
+        if not result.passed:
+            return result
+        return await check_pii(input_data)
+
+    starts: dict[int, int] = {}
+    _HS_DB.scan(input_data.encode("ascii"), match_event_handler=_on_match, context=starts)
+
+    pattern_id = _first_match(starts, range(_HS_PII_FIRST_ID))
+    if pattern_id is None:
+        pattern_id = _first_match(starts, range(_HS_PII_FIRST_ID, len(_HS_MESSAGES)))
+    if pattern_id is not None:
+        return GuardrailResult(passed=False, message=_HS_MESSAGES[pattern_id])
+
+    return GuardrailResult(passed=True)
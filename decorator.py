@@ -1,18 +1,115 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import functools
+import inspect
 import logging
 from typing import Any, Callable, Type, List, Optional
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from .data_models import OnFailAction, GuardrailCheck, CheckFailureException, ValidationException, FullPromptLinterConfig
-from .adapters.registry import registry
+from .adapters.registry import registry, is_async_callable
+from .checks import check_injection, check_injection_sync, check_pii, check_pii_sync
 from .profiler import token_profiler
 from .prompt_linter import PromptLinter
 
 logger = logging.getLogger(__name__)
 
+# Marker returned by the output/error handlers when the call should be retried
+_RETRY = object()
+
+_SYNC_CHECKS = {
+    check_injection: check_injection_sync,
+    check_pii: check_pii_sync,
+}
+
+@functools.lru_cache(maxsize=None)
+def _schema_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """One TypeAdapter per schema, so guardrails sharing a schema share its validator."""
+    return TypeAdapter(schema)
+
+def _check_failed(result: Any) -> bool:
+    # Check if it's a GuardrailResult or just a bool
+    if hasattr(result, "passed"):
+        return not result.passed
+    return not result
+
+def _failure_message(check: Callable, result: Any) -> str:
+    if hasattr(result, "passed"):
+        return f"Input check failed: {result.message}"
+    return f"Input check failed: {check.__name__}"
+
+async def _first_failure(checks: List[tuple[Callable, bool]], input_text: str, input_data: Any) -> Optional[tuple[Callable, Any]]:
+    """
+    Returns the failing (check, result) pair that comes first in list order,
+    or None if all pass. If a check raises before any earlier check fails, its
+    exception is raised. Checks flagged inline are called directly with the
+    input text; the others get the input as passed and run concurrently, and
+    any still pending once an earlier check has failed are cancelled.
+    """
+    first = len(checks)
+    failure = None
+    awaited = []
+    for index, (check, inline) in enumerate(checks):
+        if not inline:
+            awaited.append(index)
+            continue
+        result = check(input_text)
+        if _check_failed(result):
+            first, failure = index, (check, result)
+            break
+
+    if not awaited:
+        return failure
+    # A lone check has nothing to overlap with, so skip the task machinery
+    if len(awaited) == 1:
+        check = checks[awaited[0]][0]
+        result = await check(input_data)
+        return (check, result) if _check_failed(result) else failure
+
+    tasks = {asyncio.ensure_future(checks[index][0](input_data)): index for index in awaited}
+    pending = set(tasks)
+    try:
+        while any(tasks[task] < first for task in pending):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None or _check_failed(task.result()):
+                    first = min(first, tasks[task])
+        for task, index in tasks.items():
+            if index == first:
+                # Raises the check's exception if it did not return
+                return checks[index][0], task.result()
+        return failure
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+async def _all_results(checks: List[tuple[Callable, bool]], input_text: str, input_data: Any) -> List[tuple[Callable, Any]]:
+    """
+    Runs every check and returns (check, result) pairs in list order. A check
+    that raised has its exception as the result, so earlier failures can be
+    handled before it is re-raised.
+    """
+    awaited = [check(input_data) for check, inline in checks if not inline]
+    if len(awaited) == 1:
+        try:
+            awaited_results = [await awaited[0]]
+        except Exception as e:
+            awaited_results = [e]
+    elif awaited:
+        awaited_results = await asyncio.gather(*awaited, return_exceptions=True)
+    else:
+        awaited_results = []
+
+    awaited_iter = iter(awaited_results)
+    return [
+        (check, check(input_text) if inline else next(awaited_iter))
+        for check, inline in checks
+    ]
+
 def guardrail(
     input_checks: List[Callable[[Any], Any]] = None,
     output_schema: Optional[Type[BaseModel]] = None,
@@ -21,13 +118,15 @@ def guardrail(
     fallback_value: Any = None,
     model_name: Optional[str] = None,
     enable_profiling: bool = False,
-    prompt_linter_config: Optional[FullPromptLinterConfig] = None
+    prompt_linter_config: Optional[FullPromptLinterConfig] = None,
+    sync: bool = False
 ):
     """
     Decorator to apply guardrails to a function.
     
     Args:
-        input_checks: List of functions to check the input data.
+        input_checks: List of functions to check the input data. The built-in
+            checks receive it as a str; other checks receive it as passed.
         output_schema: Pydantic model to validate the output.
         on_fail: Action to take on failure (retry, exception, fallback).
         max_retries: Number of retries if on_fail is 'retry'.
@@ -35,16 +134,132 @@ def guardrail(
         model_name: Name of the model for token profiling.
         enable_profiling: Whether to enable token utilization and cost profiling.
         prompt_linter_config: Configuration for prompt linting.
+        sync: Keep a plain function synchronous instead of returning a
+            coroutine function. Requires sync input checks and no linter.
     """
     input_checks = input_checks or []
     linter = PromptLinter(prompt_linter_config) if prompt_linter_config else None
+    # Built-in async checks are swapped for their sync variants, which never
+    # await: they run inline on the input text. Each check is paired with
+    # whether it is such a built-in.
+    sync_checks = [
+        (_SYNC_CHECKS[check], True) if check in _SYNC_CHECKS else (check, False)
+        for check in input_checks
+    ]
+    has_builtin_checks = any(inline for _, inline in sync_checks)
+    validate_output = _schema_adapter(output_schema).validate_python if output_schema else None
+
+    def finish_output(input_data: Any, output: Any, retries: int) -> Any:
+        """Profiles and validates an output. Returns the value to hand back, or _RETRY."""
+        # Token Profiling
+        if enable_profiling and model_name:
+            usage = token_profiler.estimate_cost(model_name, input_data, output)
+            logger.info(
+                f"Token Utilization [{model_name}]: "
+                f"Input: {usage.input_tokens}, Output: {usage.output_tokens}, "
+                f"Total: {usage.total_tokens}, Estimated Cost: ${usage.estimated_cost:.6f}, "
+                f"Carbon: {usage.carbon_emissions_g:.4f}g CO2e"
+            )
+            # Optionally attach usage to output if it's a dict and not already present
+            if isinstance(output, dict) and "usage" not in output:
+                output["usage"] = usage.model_dump()
+
+        # Validate output schema
+        if validate_output:
+            try:
+                validate_output(output)
+            except ValidationError as e:
+                msg = f"Output validation failed: {str(e)}"
+                if on_fail == OnFailAction.EXCEPTION:
+                    raise ValidationException(msg)
+                logger.warning(msg)
+                
+                if on_fail == OnFailAction.RETRY and retries < max_retries:
+                    logger.info(f"Retrying execution (attempt {retries + 1})")
+                    return _RETRY
+                
+                if on_fail == OnFailAction.FALLBACK:
+                    return fallback_value
+                raise ValidationException(msg)
+
+        return output
+
+    def handle_error(e: Exception, retries: int) -> Any:
+        """Applies on_fail to an exception. Returns the value to hand back, or _RETRY."""
+        if on_fail == OnFailAction.RETRY and retries < max_retries:
+            logger.info(f"Retrying execution due to exception: {str(e)} (attempt {retries + 1})")
+            return _RETRY
+        
+        if on_fail == OnFailAction.FALLBACK:
+            return fallback_value
+        
+        if not isinstance(e, (ValidationException, CheckFailureException)):
+            raise e
+        
+        if on_fail == OnFailAction.EXCEPTION:
+            raise e
+        
+        return None
 
     def decorator(func: Callable):
         adapter = registry.get_adapter(func)
+        call_target = adapter.bind_call(func)
+        call_sync = adapter.bind_sync_call(func)
+        extract_input = adapter.bind_extract(func)
+
+        if sync:
+            # Nothing may need awaiting for the guarded function to stay synchronous
+            if linter is not None:
+                raise ValueError("sync=True cannot be combined with prompt_linter_config")
+            if call_sync is None:
+                raise TypeError(f"sync=True requires a synchronous function, got {func.__name__!r}")
+            for check, _ in sync_checks:
+                if is_async_callable(check):
+                    raise TypeError(f"sync=True requires synchronous input checks, got {getattr(check, '__name__', check)!r}")
+
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                input_data = extract_input(args, kwargs)
+
+                # Perform input checks
+                if sync_checks:
+                    # Built-in checks receive the input as text, coerced once here
+                    input_text = input_data if not has_builtin_checks or isinstance(input_data, str) else str(input_data)
+                    for check, takes_text in sync_checks:
+                        result = check(input_text if takes_text else input_data)
+                        if inspect.isawaitable(result):
+                            # Only an async guarded function can await the check
+                            if inspect.iscoroutine(result):
+                                result.close()
+                            raise TypeError(
+                                f"Input check {getattr(check, '__name__', check)!r} returned an awaitable "
+                                f"for synchronous function {func.__name__!r}; use a synchronous check "
+                                f"or drop sync=True"
+                            )
+                        if _check_failed(result):
+                            msg = _failure_message(check, result)
+                            if on_fail == OnFailAction.EXCEPTION:
+                                raise CheckFailureException(msg)
+                            logger.warning(msg)
+                            if on_fail == OnFailAction.FALLBACK:
+                                return fallback_value
+
+                # Execute the function with retry logic
+                retries = 0
+                while True:
+                    try:
+                        result = finish_output(input_data, call_sync(*args, **kwargs), retries)
+                    except Exception as e:
+                        result = handle_error(e, retries)
+                    if result is not _RETRY:
+                        return result
+                    retries += 1
+
+            return sync_wrapper
 
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            input_data = adapter.extract_input(*args, **kwargs)
+            input_data = extract_input(args, kwargs)
             
             # Prompt Linter Check
             if linter:
@@ -69,82 +284,36 @@ def guardrail(
                     elif lint_result.message: # Contains warnings
                         logger.warning(f"Prompt Linter warnings: {lint_result.message}")
 
-            # Perform input checks
-            for check in input_checks:
-                result = await check(input_data)
-                # Check if it's a GuardrailResult or just a bool
-                if hasattr(result, "passed"):
-                    if not result.passed:
-                        msg = f"Input check failed: {result.message}"
+            # Perform input checks concurrently; failures are reported in list order
+            if input_checks:
+                # Built-in checks receive the input as text, coerced once here
+                input_text = input_data if not has_builtin_checks or isinstance(input_data, str) else str(input_data)
+                if on_fail == OnFailAction.RETRY:
+                    # Every failure is logged, so let all checks finish
+                    for check, result in await _all_results(sync_checks, input_text, input_data):
+                        if isinstance(result, BaseException):
+                            raise result
+                        if _check_failed(result):
+                            logger.warning(_failure_message(check, result))
+                else:
+                    failure = await _first_failure(sync_checks, input_text, input_data)
+                    if failure:
+                        msg = _failure_message(*failure)
                         if on_fail == OnFailAction.EXCEPTION:
                             raise CheckFailureException(msg)
                         logger.warning(msg)
-                        if on_fail == OnFailAction.FALLBACK:
-                            return fallback_value
-                elif not result:
-                    msg = f"Input check failed: {check.__name__}"
-                    if on_fail == OnFailAction.EXCEPTION:
-                        raise CheckFailureException(msg)
-                    logger.warning(msg)
-                    if on_fail == OnFailAction.FALLBACK:
                         return fallback_value
 
             # Execute the function with retry logic
             retries = 0
             while True:
                 try:
-                    output = await adapter.call(func, *args, **kwargs)
-                    
-                    # Token Profiling
-                    if enable_profiling and model_name:
-                        usage = token_profiler.estimate_cost(model_name, input_data, output)
-                        logger.info(
-                            f"Token Utilization [{model_name}]: "
-                            f"Input: {usage.input_tokens}, Output: {usage.output_tokens}, "
-                            f"Total: {usage.total_tokens}, Estimated Cost: ${usage.estimated_cost:.6f}, "
-                            f"Carbon: {usage.carbon_emissions_g:.4f}g CO2e"
-                        )
-                        # Optionally attach usage to output if it's a dict and not already present
-                        if isinstance(output, dict) and "usage" not in output:
-                            output["usage"] = usage.model_dump()
-
-                    # Validate output schema
-                    if output_schema:
-                        try:
-                            output_schema.model_validate(output)
-                        except ValidationError as e:
-                            msg = f"Output validation failed: {str(e)}"
-                            if on_fail == OnFailAction.EXCEPTION:
-                                raise ValidationException(msg)
-                            logger.warning(msg)
-                            
-                            if on_fail == OnFailAction.RETRY and retries < max_retries:
-                                retries += 1
-                                logger.info(f"Retrying execution (attempt {retries})")
-                                continue
-                            
-                            if on_fail == OnFailAction.FALLBACK:
-                                return fallback_value
-                            raise ValidationException(msg)
-
-                    return output
-
+                    result = finish_output(input_data, await call_target(*args, **kwargs), retries)
                 except Exception as e:
-                    if on_fail == OnFailAction.RETRY and retries < max_retries:
-                        retries += 1
-                        logger.info(f"Retrying execution due to exception: {str(e)} (attempt {retries})")
-                        continue
-                    
-                    if on_fail == OnFailAction.FALLBACK:
-                        return fallback_value
-                    
-                    if not isinstance(e, (ValidationException, CheckFailureException)):
-                        raise e
-                    
-                    if on_fail == OnFailAction.EXCEPTION:
-                        raise e
-                    
-                    return None
+                    result = handle_error(e, retries)
+                if result is not _RETRY:
+                    return result
+                retries += 1
 
         return wrapper
 
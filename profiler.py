@@ -8,6 +8,11 @@ from pathlib import Path
 from .data_models import TokenUsage
 from .sustainability.calculator import sustainability_calculator
 
+try:
+    import orjson  # Optional dependency: faster JSON parsing
+except ImportError:
+    orjson = None
+
 class TokenProfiler:
     def __init__(self, token_details_path: Optional[str] = None):
         if token_details_path is None:
@@ -15,20 +20,22 @@ class TokenProfiler:
         
         self.token_details_path = token_details_path
         self.model_costs = self._load_token_details()
+        self._by_name: dict[str, dict[str, Any]] = {}
+        for provider in self.model_costs:
+            for variant in provider.get("variants", []):
+                # Keep the first entry when a model is listed more than once
+                self._by_name.setdefault(variant["model_name"], variant)
 
     def _load_token_details(self) -> list[dict[str, Any]]:
         if not os.path.exists(self.token_details_path):
             return []
-        with open(self.token_details_path, "r") as f:
-            return json.load(f)
+        data = Path(self.token_details_path).read_bytes()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
 
     def get_model_info(self, model_name: str) -> Optional[dict[str, Any]]:
-        for provider in self.model_costs:
-            for variant in provider.get("variants", []):
-                if variant["model_name"] == model_name:
-                    # Return variant info with provider metadata if needed
-                    return variant
-        return None
+        return self._by_name.get(model_name)
 
     def count_tokens(self, text: Any) -> int:
         """Simple token counting heuristic (approx 4 characters per token)."""
@@ -37,11 +44,22 @@ class TokenProfiler:
         if not isinstance(text, str):
             text = str(text)
         # Rough heuristic: 1 token ~= 4 characters
-        return max(1, len(text) // 4)
+        return len(text) >> 2 or 1
+
+    @staticmethod
+    def _count_str(text: str) -> int:
+        """`count_tokens` for callers that already hold a str."""
+        n = len(text)
+        return (n >> 2 or 1) if n else 0
 
     def estimate_cost(self, model_name: str, input_text: Any, output_text: Any) -> TokenUsage:
-        input_tokens = self.count_tokens(input_text)
-        output_tokens = self.count_tokens(output_text)
+        # Falsy non-str values count as zero tokens, matching `count_tokens`
+        if not isinstance(input_text, str):
+            input_text = str(input_text) if input_text else ""
+        if not isinstance(output_text, str):
+            output_text = str(output_text) if output_text else ""
+        input_tokens = self._count_str(input_text)
+        output_tokens = self._count_str(output_text)
         total_tokens = input_tokens + output_tokens
         
         cost = 0.0
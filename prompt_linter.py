@@ -1,56 +1,78 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import re
 from typing import Any, Optional
 from .data_models import FullPromptLinterConfig, GuardrailResult
 from .profiler import token_profiler
 
+_BROKEN_OPEN = re.compile(r"\{[^{}]*$")
+_BROKEN_CLOSE = re.compile(r"^[^{}]*\}")
+_XML_RE = re.compile(r"<[a-zA-Z0-9]+>.*?</[a-zA-Z0-9]+>", re.DOTALL)
+_VAR_RE = re.compile(r"\{([a-zA-Z_]\w*)\}")
+_FALLBACK_RE = re.compile(
+    "|".join(map(re.escape, ["if you don't know", "fallback", "I'm sorry", "cannot answer"])),
+    re.IGNORECASE,
+)
+
 class PromptLinter:
     def __init__(self, config: Optional[FullPromptLinterConfig] = None):
         self.config = config or FullPromptLinterConfig()
+        self._expected_var_patterns = [(v, f"{{{v}}}") for v in self.config.prompt_config.expected_variables]
+        # Lint results depend only on the prompt and the variable names, so
+        # repeated templates are linted once per linter instance.
+        self._lint_cached = functools.lru_cache(maxsize=1024)(self._lint)
 
     async def lint(self, prompt: str, variables: Optional[dict[str, Any]] = None) -> GuardrailResult:
         """
         Lints the prompt based on configuration.
         """
+        passed, message, warnings = self._lint_cached(prompt, frozenset(variables or ()))
+        if message is None:
+            return GuardrailResult(passed=True)
+        return GuardrailResult(passed=passed, message=message, data={"warnings": list(warnings)})
+
+    def _lint(self, prompt: str, variable_names: frozenset[str]) -> tuple[bool, Optional[str], tuple[str, ...]]:
         errors = []
         warnings = []
         
         # 1. Structural Errors: Broken placeholders
         # Look for things like {{var} or {var
-        broken_placeholders = re.findall(r"\{[^{}]*$", prompt) + re.findall(r"^[^{}]*\}", prompt)
+        broken_placeholders = _BROKEN_OPEN.findall(prompt) + _BROKEN_CLOSE.findall(prompt)
         if broken_placeholders:
             errors.append(f"Structural Error: Potential broken placeholders detected: {broken_placeholders}")
 
         # Missing variables
-        if self.config.prompt_config.expected_variables:
-            for var in self.config.prompt_config.expected_variables:
-                if f"{{{var}}}" not in prompt:
-                    errors.append(f"Structural Error: Expected variable '{{{var}}}' not found in prompt.")
+        if self._expected_var_patterns:
+            found = set(_VAR_RE.findall(prompt))
+            for var, placeholder in self._expected_var_patterns:
+                # Names that are not identifiers fall back to a substring test
+                if var not in found and placeholder not in prompt:
+                    errors.append(f"Structural Error: Expected variable '{placeholder}' not found in prompt.")
 
         # 2. Best Practices
         # XML tags/Markdown delimiters
         if self.config.prompt_config.enforce_xml_tags:
             # Check for common XML tag patterns like <context>, <query>
-            if not re.search(r"<[a-zA-Z0-9]+>.*?</[a-zA-Z0-9]+>", prompt, re.DOTALL):
+            if not _XML_RE.search(prompt):
                 warnings.append("Best Practice: No XML tags detected despite 'enforce_xml_tags' being enabled.")
 
         # Fallback instructions
         if self.config.prompt_config.require_fallback_phrase:
-            fallback_keywords = ["if you don't know", "fallback", "I'm sorry", "cannot answer"]
-            if not any(kw.lower() in prompt.lower() for kw in fallback_keywords):
+            if not _FALLBACK_RE.search(prompt):
                 warnings.append("Best Practice: No fallback instructions (e.g., 'if you don't know') detected.")
 
         # 3. Optimization: Static vs Dynamic token budget
-        # We estimate static budget by looking at prompt without variables
-        static_prompt = prompt
-        if variables:
-            for k, v in variables.items():
-                static_prompt = static_prompt.replace(f"{{{k}}}", "")
+        # We estimate static budget by discounting the characters taken by
+        # variable placeholders, using the profiler's ~4 characters per token
+        static_chars = len(prompt)
+        for k in variable_names:
+            placeholder = f"{{{k}}}"
+            static_chars -= prompt.count(placeholder) * len(placeholder)
         
-        total_tokens = token_profiler.count_tokens(prompt)
-        static_tokens = token_profiler.count_tokens(static_prompt)
+        total_tokens = token_profiler._count_str(prompt)
+        static_tokens = (static_chars >> 2 or 1) if static_chars else 0
         
         if total_tokens > 0:
             static_ratio = static_tokens / total_tokens
@@ -61,12 +83,12 @@ class PromptLinter:
                 )
 
         if errors:
-            return GuardrailResult(passed=False, message="; ".join(errors), data={"warnings": warnings})
+            return False, "; ".join(errors), tuple(warnings)
         
         if warnings:
-            return GuardrailResult(passed=True, message="; ".join(warnings), data={"warnings": warnings})
+            return True, "; ".join(warnings), tuple(warnings)
 
-        return GuardrailResult(passed=True)
+        return True, None, ()
 
 # Standard linter
 standard_linter = PromptLinter()
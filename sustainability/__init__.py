@@ -2,4 +2,4 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from .calculator import CarbonCalculator, sustainability_calculator
-from .checks import check_prompt_efficiency
+from .checks import check_prompt_efficiency, check_prompt_efficiency_batch
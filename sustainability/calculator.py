@@ -1,60 +1,134 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import json
 import os
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
 
-@dataclass
+try:
+    import orjson  # Optional dependency: faster JSON parsing
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # Optional dependency: batch calculations
+except ImportError:
+    np = None
+
+# 3.6M Joules in 1 kWh
+_JOULES_PER_KWH = 3_600_000
+# Standard phone battery ~ 15 Wh = 0.015 kWh
+_PHONE_BATTERY_KWH = 0.015
+
+def _flops_kwh(param_count_billions: float, total_tokens: Any, flops_per_watt: float) -> Any:
+    """Energy in kWh for 2 * Parameters * Tokens FLOPs; works on scalars and arrays."""
+    return 2 * (param_count_billions * 1e9) * total_tokens / flops_per_watt / _JOULES_PER_KWH
+
+def _round_array(values: "np.ndarray", ndigits: int) -> "np.ndarray":
+    """Python's `round` on each element; `np.round` breaks decimal ties differently."""
+    rounded = [round(value, ndigits) for value in values.ravel().tolist()]
+    return np.array(rounded, dtype=float).reshape(values.shape)
+
+@functools.lru_cache(maxsize=None)
+def _flops_kwh_kernel() -> Any:
+    """
+    `_flops_kwh` compiled with Numba for token-count arrays, or the plain
+    function if Numba is not installed. Numba is imported on first use as it
+    is slow to import; per-scalar calls stay in Python, where the JIT's
+    dispatch overhead outweighs the arithmetic.
+    """
+    try:
+        from numba import njit  # Optional dependency: JIT-compiled batch arithmetic
+    except ImportError:
+        return _flops_kwh
+    # No fastmath: reassociating the divisions would change the results
+    return njit(cache=True)(_flops_kwh)
+
+@dataclass(frozen=True, slots=True)
 class HardwareProfile:
     name: str
     flops_per_watt: float # Efficiency (GFLOPS/Watt)
 
+# Standard Grid Intensities (gCO2e / kWh)
+_GRID_INTENSITY = {
+    "GLOBAL_AVG": 475.0, # IEA Global Average
+    "US_AVG": 380.0,
+    "EU_AVG": 255.0,
+    "SWEDEN": 45.0,      # Hydro/Nuclear heavy (Green)
+    "COAL_HEAVY": 820.0  # Regions relying on coal
+}
+
+# Hardware Efficiency Profiles (Real-world FP16 inference estimates)
+# Using the provided values, adjusted for consistency
+_HARDWARE = {
+    "NVIDIA_A100": HardwareProfile("NVIDIA A100", 150.0e9), # 150 GFLOPS/Watt
+    "NVIDIA_H100": HardwareProfile("NVIDIA H100", 250.0e9), # ~250 GFLOPS/Watt
+    "CONSUMER_GPU": HardwareProfile("RTX 4090", 50.0e9),    # Less efficient per watt
+}
+_DEFAULT_HARDWARE = _HARDWARE["NVIDIA_A100"]
+
 class CarbonCalculator:
-    # Standard Grid Intensities (gCO2e / kWh)
-    GRID_INTENSITY = {
-        "GLOBAL_AVG": 475.0, # IEA Global Average
-        "US_AVG": 380.0,
-        "EU_AVG": 255.0,
-        "SWEDEN": 45.0,      # Hydro/Nuclear heavy (Green)
-        "COAL_HEAVY": 820.0  # Regions relying on coal
-    }
-
-    # Hardware Efficiency Profiles (Real-world FP16 inference estimates)
-    # Using the provided values, adjusted for consistency
-    HARDWARE = {
-        "NVIDIA_A100": HardwareProfile("NVIDIA A100", 150.0e9), # 150 GFLOPS/Watt
-        "NVIDIA_H100": HardwareProfile("NVIDIA H100", 250.0e9), # ~250 GFLOPS/Watt
-        "CONSUMER_GPU": HardwareProfile("RTX 4090", 50.0e9),    # Less efficient per watt
-    }
+    # Class-level aliases of the module tables, kept for existing callers
+    GRID_INTENSITY = _GRID_INTENSITY
+    HARDWARE = _HARDWARE
 
     def __init__(self, hardware: str = "NVIDIA_A100", region: str = "GLOBAL_AVG", reference_data_path: Optional[str] = None):
-        self.hardware = self.HARDWARE.get(hardware, self.HARDWARE["NVIDIA_A100"])
-        self.grid_intensity = self.GRID_INTENSITY.get(region, 475.0)
+        self.hardware = _HARDWARE.get(hardware, _DEFAULT_HARDWARE)
+        self.grid_intensity = _GRID_INTENSITY.get(region, 475.0)
         
         if reference_data_path is None:
             reference_data_path = str(Path(__file__).parent / "reference_data.json")
-        
-        self.reference_data = self._load_reference_data(reference_data_path)
+        # Read on first model lookup; FLOPs-only calculators never parse it
+        self._reference_data_path = reference_data_path
+
+        # The calculator's state is fixed after init, so repeated
+        # (tokens, params, model) requests reuse the computed metrics.
+        self._emissions_cached = functools.lru_cache(maxsize=4096)(self._emissions)
+
+    @functools.cached_property
+    def reference_data(self) -> list:
+        return self._load_reference_data(self._reference_data_path)
+
+    @functools.cached_property
+    def _factor_by_model(self) -> Dict[str, Optional[float]]:
+        factor_by_model: Dict[str, Optional[float]] = {}
+        for record in self._iter_model_records(self.reference_data):
+            # Keys are case-folded once here; keep the first entry when a
+            # model is listed more than once
+            factor_by_model.setdefault(record["model_name"].casefold(), record.get("energy_factor_wh_per_1k"))
+        return factor_by_model
 
     def _load_reference_data(self, path: str) -> list:
         if not os.path.exists(path):
             return []
         try:
-            with open(path, "r") as f:
-                return json.load(f)
+            # Parse the raw bytes directly; no separate text decode pass
+            data = Path(path).read_bytes()
+            if orjson is not None:
+                return orjson.loads(data)
+            return json.loads(data)
         except Exception:
             return []
 
+    @staticmethod
+    def _iter_model_records(reference_data: list) -> Iterator[Dict[str, Any]]:
+        """
+        Yields one record per model. Accepts the nested provider layout
+        (`[{"model_provider": ..., "variants": [...]}]`) as well as a flat list
+        of model records, which can be loaded without the per-provider lists.
+        """
+        for entry in reference_data:
+            if "model_name" in entry:
+                yield entry
+            else:
+                yield from entry.get("variants", [])
+
     def get_model_energy_factor(self, model_name: str) -> Optional[float]:
         """Returns energy_factor_wh_per_1k if found in reference_data."""
-        for provider in self.reference_data:
-            for variant in provider.get("variants", []):
-                if variant["model_name"].lower() == model_name.lower():
-                    return variant.get("energy_factor_wh_per_1k")
-        return None
+        return self._factor_by_model.get(model_name.casefold())
 
     def calculate_emissions(self, total_tokens: int, param_count_billions: Optional[float] = None, model_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -63,7 +137,62 @@ class CarbonCalculator:
         param_count_billions: e.g., 70 for Llama-3-70B (Optional if model_name is provided)
         model_name: Optional, used to look up energy factors in reference_data.json
         """
-        
+        energy_kwh, carbon_grams, phone_charges, method = self._emissions_cached(total_tokens, param_count_billions, model_name)
+
+        return {
+            "model_info": model_name or (f"{param_count_billions}B" if param_count_billions else "Unknown"),
+            "total_tokens": total_tokens,
+            "energy_kwh": energy_kwh,
+            "carbon_g": carbon_grams,
+            "phone_charges": phone_charges,
+            "calculation_method": method
+        }
+
+    def calculate_carbon_g(self, total_tokens: int, param_count_billions: Optional[float] = None, model_name: Optional[str] = None) -> float:
+        """
+        Returns only the `carbon_g` value of `calculate_emissions`, without
+        building the full metrics dict.
+        """
+        return self._emissions_cached(total_tokens, param_count_billions, model_name)[1]
+
+    def calculate_emissions_batch(self, total_tokens: "np.ndarray", param_count_billions: Optional[float] = None, model_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Vectorized `calculate_emissions` for an array of token counts sharing
+        the same model. Returns the same keys, with NumPy arrays as values
+        (except model_info). Requires numpy.
+        """
+        if np is None:
+            raise ImportError("calculate_emissions_batch requires numpy")
+
+        tokens = np.asarray(total_tokens, dtype=np.int64)
+        energy_kwh = np.zeros(tokens.shape)
+        method = np.full(tokens.shape, "unknown", dtype=object)
+
+        # Priority 1: Use model-specific energy factor from reference_data.json
+        factor = self.get_model_energy_factor(model_name) if model_name else None
+        if factor is not None:
+            # factor is Watt-hours per 1k tokens
+            energy_kwh = (tokens / 1000.0) * factor / 1000.0
+            method[:] = f"model_reference ({model_name})"
+
+        # Priority 2: FLOPs-based calculation wherever the model lookup gave nothing
+        if param_count_billions is not None:
+            use_flops = energy_kwh == 0.0
+            flops_kwh = _flops_kwh_kernel()(float(param_count_billions), tokens, self.hardware.flops_per_watt)
+            energy_kwh = np.where(use_flops, flops_kwh, energy_kwh)
+            method[use_flops] = f"hardware_flops ({self.hardware.name})"
+
+        return {
+            "model_info": model_name or (f"{param_count_billions}B" if param_count_billions else "Unknown"),
+            "total_tokens": tokens,
+            "energy_kwh": _round_array(energy_kwh, 8),
+            "carbon_g": _round_array(energy_kwh * self.grid_intensity, 6),
+            "phone_charges": _round_array(energy_kwh / _PHONE_BATTERY_KWH, 4),
+            "calculation_method": method
+        }
+
+    def _emissions(self, total_tokens: int, param_count_billions: Optional[float], model_name: Optional[str]) -> Tuple[float, float, float, str]:
+        """Returns the rounded (energy_kwh, carbon_g, phone_charges, method) metrics."""
         energy_kwh = 0.0
         method = "unknown"
 
@@ -72,37 +201,27 @@ class CarbonCalculator:
             factor = self.get_model_energy_factor(model_name)
             if factor is not None:
                 # factor is Watt-hours per 1k tokens
-                energy_wh = (total_tokens / 1000.0) * factor
-                energy_kwh = energy_wh / 1000.0
+                energy_kwh = total_tokens / 1000.0 * factor / 1000.0
                 method = f"model_reference ({model_name})"
 
         # Priority 2: Use FLOPs-based calculation if param_count is known and model lookup failed
         if energy_kwh == 0.0 and param_count_billions is not None:
-            # 1. Calculate Compute Load (FLOPs)
-            # Formula: 2 * Parameters * Tokens
-            N = param_count_billions * 1e9
-            total_flops = 2 * N * total_tokens
-            
-            # 2. Calculate Energy (Joules & kWh)
-            energy_joules = total_flops / self.hardware.flops_per_watt
-            energy_kwh = energy_joules / 3_600_000 # 3.6M Joules in 1 kWh
+            # Formula: 2 * Parameters * Tokens FLOPs, then Joules -> kWh.
+            # Inlined from `_flops_kwh` to skip a function call on the scalar path.
+            energy_kwh = 2 * (param_count_billions * 1e9) * total_tokens / self.hardware.flops_per_watt / _JOULES_PER_KWH
             method = f"hardware_flops ({self.hardware.name})"
         
-        # 3. Calculate Carbon (Grams)
-        carbon_grams = energy_kwh * self.grid_intensity
-        
-        # 4. Contextualize (Smartphone Charges)
-        # Standard phone battery ~ 15 Wh = 0.015 kWh
-        phone_charges = energy_kwh / 0.015
+        # Nothing to round for zero-token requests or unknown models
+        if energy_kwh == 0.0:
+            return 0.0, 0.0, 0.0, method
 
-        return {
-            "model_info": model_name or (f"{param_count_billions}B" if param_count_billions else "Unknown"),
-            "total_tokens": total_tokens,
-            "energy_kwh": round(energy_kwh, 8),
-            "carbon_g": round(carbon_grams, 6),
-            "phone_charges": round(phone_charges, 4),
-            "calculation_method": method
-        }
+        # 3. Carbon (grams) and 4. smartphone charges
+        return (
+            round(energy_kwh, 8),
+            round(energy_kwh * self.grid_intensity, 6),
+            round(energy_kwh / _PHONE_BATTERY_KWH, 4),
+            method,
+        )
 
 # Global instance for easy access
 sustainability_calculator = CarbonCalculator()
@@ -1,23 +1,35 @@
 # SPDX-FileCopyrightText: Copyright (c) 2026. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Sequence
 from ..data_models import GuardrailResult
 from .calculator import sustainability_calculator
 from ..profiler import token_profiler
 
-async def check_prompt_efficiency(input_data: Any, max_carbon_g: float = 0.05) -> GuardrailResult:
+# Bound once at import; the profiler and calculator are module-level singletons
+_count_tokens = token_profiler.count_tokens
+_calc = sustainability_calculator.calculate_emissions
+_carbon_g = sustainability_calculator.calculate_carbon_g
+
+async def check_prompt_efficiency(input_data: Any, max_carbon_g: float = 0.05, include_stats: bool = False) -> GuardrailResult:
     """
     Checks if the prompt is efficient in terms of estimated carbon footprint.
     This check estimates the carbon emissions for the input prompt.
+    Failing results carry the full emission stats as `data`; passing results
+    carry them too when `include_stats` is True.
     """
     if not isinstance(input_data, str):
         text = str(input_data)
     else:
         text = input_data
 
+    # An empty prompt has no tokens and therefore no emissions for any model,
+    # so no reference data is read here
+    if not text and max_carbon_g >= 0 and not include_stats:
+        return _pass_result(0.0)
+
     # Estimate tokens for the input
-    tokens = token_profiler.count_tokens(text)
+    tokens = _count_tokens(text)
     
     # Estimate carbon for these tokens (assuming a standard model if none provided, or just base on tokens)
     # We'll use a conservative estimate or a default model name if we want more accuracy.
@@ -25,19 +37,52 @@ async def check_prompt_efficiency(input_data: Any, max_carbon_g: float = 0.05) -
     # but since we have the calculator, let's use it.
     
     # Assuming a mid-range model like gpt-4o for reference if none specified
-    stats = sustainability_calculator.calculate_emissions(total_tokens=tokens, model_name="gpt-4o")
-    carbon_g = stats["carbon_g"]
-
+    carbon_g = _carbon_g(tokens, model_name="gpt-4o")
     if carbon_g > max_carbon_g:
-        return GuardrailResult(
-            passed=False, 
-            message=f"Prompt is inefficient: Estimated input carbon ({carbon_g:.4f}g) exceeds limit ({max_carbon_g}g). "
-                    f"Consider shortening the prompt or removing redundant information.",
-            data=stats
-        )
+        return _failure_result(_calc(total_tokens=tokens, model_name="gpt-4o"), max_carbon_g)
+    if include_stats:
+        return _pass_result(carbon_g, _calc(total_tokens=tokens, model_name="gpt-4o"))
+    # The stats dict is only assembled when a caller will see it
+    return _pass_result(carbon_g)
+
+async def check_prompt_efficiency_batch(inputs: Sequence[Any], max_carbon_g: float = 0.05, include_stats: bool = False) -> List[GuardrailResult]:
+    """
+    Batch variant of `check_prompt_efficiency`.
+    Token counts for all inputs are converted to carbon estimates in one
+    vectorized calculation. Requires numpy.
+    """
+    tokens = [token_profiler.count_tokens(text if isinstance(text, str) else str(text)) for text in inputs]
+    batch = sustainability_calculator.calculate_emissions_batch(tokens, model_name="gpt-4o")
 
+    results = []
+    for i, carbon_g in enumerate(batch["carbon_g"].tolist()):
+        passed = not carbon_g > max_carbon_g
+        if passed and not include_stats:
+            results.append(_pass_result(carbon_g))
+            continue
+        stats = {
+            "model_info": batch["model_info"],
+            "total_tokens": tokens[i],
+            "energy_kwh": batch["energy_kwh"][i].item(),
+            "carbon_g": carbon_g,
+            "phone_charges": batch["phone_charges"][i].item(),
+            "calculation_method": batch["calculation_method"][i]
+        }
+        results.append(_pass_result(carbon_g, stats) if passed else _failure_result(stats, max_carbon_g))
+    return results
+
+def _pass_result(carbon_g: float, stats: Optional[Dict[str, Any]] = None) -> GuardrailResult:
     return GuardrailResult(
         passed=True, 
         message=f"Prompt efficiency check passed: {carbon_g:.4f}g CO2e estimated.",
         data=stats
     )
+
+def _failure_result(stats: Dict[str, Any], max_carbon_g: float) -> GuardrailResult:
+    carbon_g = stats["carbon_g"]
+    return GuardrailResult(
+        passed=False, 
+        message=f"Prompt is inefficient: Estimated input carbon ({carbon_g:.4f}g) exceeds limit ({max_carbon_g}g). "
+                f"Consider shortening the prompt or removing redundant information.",
+        data=stats
+    )